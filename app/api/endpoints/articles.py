@@ -1,8 +1,22 @@
 import logging
-from typing import Dict, List, Optional
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.config import get_settings
+from app.core.pagination import (
+    FeedSnapshot,
+    create_snapshot,
+    decode_cursor,
+    encode_cursor,
+    get_snapshot,
+    page_prefetcher,
+)
+from app.core.profiler import get_profile, is_authorized, profile_request
+from app.core.response_cache import make_cache_key, response_cache
 from app.core.rss_fetcher import fetch_feed_by_url, process_feed_entries
 from app.core.analyzer import analyze_articles
 from app.core.generator import generate_contents
@@ -11,14 +25,21 @@ from app.models.article import ArticleResponse, ProcessedArticle, SentimentType
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 @router.get("/fetch", response_model=List[ArticleResponse])
 async def fetch_and_process_articles(
+    response: Response,
     feed_urls: List[str] = Query(..., description="List of RSS feed URLs to fetch"),
     limit: int = Query(5, ge=1, le=50),
     sentiment: SentimentType = None,
-    languages: List[str] = Query(["en", "hi", "te"], max_length=5)
+    languages: List[str] = Query(["en", "hi", "te"], max_length=5),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    max_pages: int = Query(settings.pagination_snapshot_pages, ge=1, le=20),
+    profile: bool = Query(False, description="Profile this request; requires the X-Profile header"),
+    x_profile: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Fetch articles from specified RSS feeds, analyze sentiment, generate content, and find images.
@@ -27,54 +48,215 @@ async def fetch_and_process_articles(
     - **limit**: Maximum number of articles to return
     - **sentiment**: Filter by sentiment (positive, neutral, negative)
     - **languages**: Languages to generate content for
+    - **cursor**: Continue from the feed snapshot of a previous page
+    - **max_pages**: Pages reachable by cursor. Without a sentiment filter each feed is read only
+      up to `limit * max_pages` items, so pagination ends after at least that many pages even if
+      the feeds hold more. With a sentiment filter feeds are read in full.
+    - **profile**: Profile this request. The profiling token must be sent in the X-Profile header,
+      which on its own also enables profiling; the profile ID is returned in X-Profile-ID
+    
+    When more articles remain, the X-Next-Cursor response header holds the cursor for the next page.
+    First pages are cached per normalized query and carry an ETag for If-None-Match revalidation.
+    """
+    # Duplicate feed URLs would fetch the same feed twice and repeat its articles
+    feed_urls = list(dict.fromkeys(feed_urls))
+    
+    # The token is only read from the header, so it never lands in access logs
+    profiling = is_authorized(x_profile)
+    if profile and not profiling:
+        raise HTTPException(status_code=403, detail="Profiling requires a valid X-Profile header")
+    
+    if profiling or cursor or not settings.response_cache_enabled:
+        async with profile_request() if profiling else nullcontext() as request_profile:
+            if request_profile:
+                response.headers["X-Profile-ID"] = request_profile.request_id
+            articles, next_cursor = await process_articles(
+                feed_urls, limit, sentiment, languages, cursor=cursor, max_pages=max_pages
+            )
+        
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return articles
+    
+    async def render() -> Tuple[bytes, Dict[str, str]]:
+        # Renders may run as background refreshes nobody reads; prefetch when a page is served instead
+        articles, next_cursor = await process_articles(
+            feed_urls, limit, sentiment, languages, max_pages=max_pages, prefetch=False
+        )
+        return JSONResponse(content=jsonable_encoder(articles)).body, {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    
+    key = make_cache_key(feed_urls, limit, sentiment.value if sentiment else None, languages, max_pages)
+    entry = await response_cache.get_or_compute(key, render)
+    
+    if "X-Next-Cursor" in entry.headers:
+        snapshot_id, next_position = decode_cursor(entry.headers["X-Next-Cursor"])
+        snapshot = get_snapshot(snapshot_id)
+        if snapshot is not None:
+            schedule_next_page(snapshot, next_position, limit, sentiment, languages)
+    
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if if_none_match and (if_none_match.strip() == "*" or entry.etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get response cache size and hit ratio."""
+    return response_cache.stats()
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(
+    feed_urls: Optional[List[str]] = Query(None, description="Feeds that changed; omit to clear the whole cache"),
+):
+    """Drop cached responses built from the given feeds."""
+    return {"invalidated": response_cache.invalidate(feed_urls)}
+
+
+@router.get("/profiles/{request_id}", response_class=PlainTextResponse)
+async def get_request_profile(
+    request_id: str,
+    kind: str = Query("cpu", pattern="^(cpu|wait)$"),
+    x_profile: Optional[str] = Header(None),
+):
+    """
+    Get a stored request profile as folded stacks for flame-graph tools.
+    Requires the profiling token in the X-Profile header.
+    
+    - **kind**: `cpu` for sampled busy-loop stacks, `wait` for self time in microseconds of pipeline calls
+    """
+    request_profile = get_profile(request_id) if is_authorized(x_profile) else None
+    if not request_profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return request_profile.folded(kind)
+
+
+async def process_articles(
+    feed_urls: List[str],
+    limit: int,
+    sentiment: Optional[SentimentType],
+    languages: List[str],
+    cursor: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    prefetch: bool = True,
+) -> Tuple[List[ArticleResponse], Optional[str]]:
+    """
+    Run the fetch, analyze, generate and image pipeline for one page of articles.
+    Returns the page and the cursor for the next page, if any articles remain.
+    A first page snapshots the feeds for up to max_pages pages. With prefetch set,
+    the next page is speculatively built in the background.
     """
+    snapshot, position = None, 0
+    if cursor:
+        try:
+            snapshot_id, position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        snapshot = get_snapshot(snapshot_id)
+        if snapshot is None:
+            raise HTTPException(status_code=410, detail="Cursor has expired, fetch the first page again")
+        if snapshot.feed_urls != sorted(set(feed_urls)):
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested feed URLs")
+    
     try:
         if not feed_urls:
             raise HTTPException(status_code=400, detail="At least one feed URL is required")
-            
-        # 1. Fetch articles from the provided URLs
-        raw_articles = await process_feed_entries(feed_urls)
-        if not raw_articles:
-            raise HTTPException(status_code=404, detail="No articles found from the provided feeds")
-            
-        # 2. Analyze sentiment
-        processed_articles = await analyze_articles(raw_articles)
         
-        # Filter by sentiment if specified
-        if sentiment:
-            processed_articles = [a for a in processed_articles if a.sentiment == sentiment]
-            
-        # Limit the number of articles
-        processed_articles = processed_articles[:limit]
+        if snapshot is None:
+            # 1. Fetch articles from the provided URLs
+            # Without a sentiment filter only the newest items of each feed can fill the first pages
+            max_entries = None if sentiment else limit * (max_pages or settings.pagination_snapshot_pages)
+            raw_articles = await process_feed_entries(feed_urls, max_entries_per_feed=max_entries)
+            if not raw_articles:
+                raise HTTPException(status_code=404, detail="No articles found from the provided feeds")
+            snapshot = create_snapshot(feed_urls, raw_articles)
         
-        # 3. Generate content in different languages
-        generated_contents = await generate_contents(processed_articles, languages)
+        # Use the speculatively built page if the previous request prefetched it
+        page = None
+        prefetched = page_prefetcher.claim((snapshot.id, position, limit, sentiment, tuple(languages)))
+        if prefetched is not None:
+            try:
+                page = await prefetched
+            except Exception as e:
+                logger.info(f"Prefetched page unavailable, rebuilding it: {str(e)}")
+        if page is None:
+            page = await build_page(snapshot, position, limit, sentiment, languages)
         
-        # 4. Get images
-        article_images = await get_images_for_articles(processed_articles)
-        
-        # 5. Prepare response
-        response = []
-        for article in processed_articles:
-            article_image = article_images.get(article.id)
-            article_response = ArticleResponse(
-                id=article.id,
-                title=article.title,
-                summary=article.summary,
-                sentiment=article.sentiment,
-                source=article.source,
-                published_date=article.published_date,
-                image_url=None,
-                image_base64=article_image.base64_image if article_image and hasattr(article_image, 'base64_image') else None,
-                generated_contents=generated_contents.get(article.id, [])
-            )
-            response.append(article_response)
+        response, next_position = page
+        if next_position is None:
+            return response, None
         
-        return response
+        if prefetch:
+            schedule_next_page(snapshot, next_position, limit, sentiment, languages)
+        return response, encode_cursor(snapshot.id, next_position)
     except Exception as e:
         logger.error(f"Error processing articles: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def schedule_next_page(
+    snapshot: FeedSnapshot,
+    position: int,
+    limit: int,
+    sentiment: Optional[SentimentType],
+    languages: List[str],
+) -> None:
+    """Speculatively build the page at position once a client holds the cursor to it."""
+    if settings.prefetch_enabled:
+        page_prefetcher.schedule(
+            (snapshot.id, position, limit, sentiment, tuple(languages)),
+            lambda: build_page(snapshot, position, limit, sentiment, languages),
+        )
 
 
+async def build_page(
+    snapshot: FeedSnapshot,
+    position: int,
+    limit: int,
+    sentiment: Optional[SentimentType],
+    languages: List[str],
+) -> Tuple[List[ArticleResponse], Optional[int]]:
+    """
+    Build the page of up to `limit` articles starting at position in the snapshot.
+    Returns the page and the position of the next page, if any articles remain.
+    """
+    # 2. Analyze sentiment, only as far into the snapshot as this page needs
+    processed_articles = []
+    while position < len(snapshot.articles) and len(processed_articles) < limit:
+        if position not in snapshot.processed:
+            analyzed = await analyze_articles([snapshot.articles[position]])
+            snapshot.processed[position] = analyzed[0] if analyzed else None
+        
+        article = snapshot.processed[position]
+        position += 1
+        
+        # Filter by sentiment if specified
+        if article and (not sentiment or article.sentiment == sentiment):
+            processed_articles.append(article)
+    
+    # 3. Generate content in different languages
+    generated_contents = await generate_contents(processed_articles, languages)
+    
+    # 4. Get images
+    article_images = await get_images_for_articles(processed_articles)
+    
+    # 5. Prepare response
+    response = []
+    for article in processed_articles:
+        article_image = article_images.get(article.id)
+        article_response = ArticleResponse(
+            id=article.id,
+            title=article.title,
+            summary=article.summary,
+            sentiment=article.sentiment,
+            source=article.source,
+            published_date=article.published_date,
+            image_url=None,
+            image_base64=article_image.base64_image if article_image and hasattr(article_image, 'base64_image') else None,
+            generated_contents=generated_contents.get(article.id, [])
+        )
+        response.append(article_response)
+    
+    return response, position if position < len(snapshot.articles) else None
@@ -17,6 +17,31 @@ class Settings(BaseSettings):
     # Image Generation
     use_ai_images: bool = True
     
+    # Feed parsing
+    stream_feeds: bool = True
+    feed_stream_chunk_size: int = 64 * 1024
+    feed_max_age_hours: float = 0.0
+    
+    # Profiling (requests opt in by sending this token in an X-Profile header)
+    profiling_token: str = ""
+    profiling_sample_interval: float = 0.005
+    profiling_max_profiles: int = 50
+    
+    # Response cache for /api/articles/fetch
+    response_cache_enabled: bool = True
+    response_cache_ttl: float = 30.0
+    response_cache_stale_ttl: float = 300.0
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    
+    # Cursor pagination and next-page prefetching
+    pagination_snapshot_pages: int = 3
+    pagination_snapshot_ttl: float = 600.0
+    pagination_max_snapshots: int = 100
+    prefetch_enabled: bool = True
+    prefetch_concurrency: int = 1
+    prefetch_budget: float = 120.0
+    prefetch_ttl: float = 300.0
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -2,12 +2,14 @@ import logging
 import uuid
 from typing import List
 
+from app.core.profiler import profiled
 from app.models.article import ProcessedArticle, RawArticle
 from app.services.openai_service import analyze_sentiment
 
 logger = logging.getLogger(__name__)
 
 
+@profiled
 async def analyze_article(article: RawArticle) -> ProcessedArticle:
     """Analyze a single article for sentiment."""
     try:
@@ -31,6 +33,7 @@ async def analyze_article(article: RawArticle) -> ProcessedArticle:
         raise
 
 
+@profiled
 async def analyze_articles(articles: List[RawArticle]) -> List[ProcessedArticle]:
     """Analyze multiple articles for sentiment."""
     processed_articles = []
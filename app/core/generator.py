@@ -2,12 +2,14 @@ import logging
 import uuid
 from typing import Dict, List
 
+from app.core.profiler import profiled
 from app.models.article import GeneratedContent, ProcessedArticle
 from app.services.openai_service import generate_article
 
 logger = logging.getLogger(__name__)
 
 
+@profiled
 async def generate_content_for_article(article: ProcessedArticle, language: str = "en") -> GeneratedContent:
     """Generate content for a single article in the specified language."""
     try:
@@ -29,6 +31,7 @@ async def generate_content_for_article(article: ProcessedArticle, language: str
         raise
 
 
+@profiled
 async def generate_contents(articles: List[ProcessedArticle], languages: List[str] = ["en", "hi", "te"]) -> Dict[str, List[GeneratedContent]]:
     """Generate content for multiple articles in multiple languages."""
     results = {}
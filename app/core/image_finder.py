@@ -6,6 +6,7 @@ from typing import Dict, Optional, Tuple, List
 from PIL import Image
 
 from app.config import get_settings
+from app.core.profiler import profiled
 from app.models.article import ArticleImage, ProcessedArticle
 from app.services.openai_service import generate_image_prompt
 
@@ -13,6 +14,7 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+@profiled
 async def generate_ai_image(prompt: str) -> Optional[Tuple[bytes, str]]:
     """Generate an image using OpenAI DALL-E."""
     try:
@@ -35,6 +37,7 @@ async def generate_ai_image(prompt: str) -> Optional[Tuple[bytes, str]]:
         return None
 
 
+@profiled
 async def get_image_for_article(article: ProcessedArticle) -> Optional[ArticleImage]:
     """Get an AI-generated image for an article and store it as base64."""
     try:
@@ -70,6 +73,7 @@ async def get_image_for_article(article: ProcessedArticle) -> Optional[ArticleIm
         return None
 
 
+@profiled
 async def get_images_for_articles(articles: List[ProcessedArticle]) -> Dict[str, ArticleImage]:
     """Get AI-generated images for multiple articles."""
     results = {}
@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import contextvars
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.models.article import ProcessedArticle, RawArticle
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Feed snapshots keyed by ID, oldest first
+_snapshots: "OrderedDict[str, FeedSnapshot]" = OrderedDict()
+
+
+class FeedSnapshot:
+    """
+    Sorted articles fetched for one set of feeds, shared by every page of a cursor.
+    Sentiment analysis results are kept per position so later pages never redo them.
+    
+    A feed that was read only up to its entry cap may hold unread items newer than later
+    positions. The snapshot is therefore cut after the newest of the truncated feeds'
+    oldest kept items, so every position it holds is correct.
+    """
+
+    def __init__(self, feed_urls: List[str], articles: List[RawArticle]):
+        self.id = uuid.uuid4().hex
+        self.feed_urls = sorted(set(feed_urls))
+        self.articles = _complete_prefix(articles)
+        self.processed: Dict[int, Optional[ProcessedArticle]] = {}
+        self.created = time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.created > settings.pagination_snapshot_ttl
+
+
+def _complete_prefix(articles: List[RawArticle]) -> List[RawArticle]:
+    """Get the newest-first articles up to the oldest one no truncated feed could still precede."""
+    oldest: Dict[str, Any] = {}
+    for article in articles:
+        if article.feed_truncated:
+            oldest[article.feed_url] = min(oldest.get(article.feed_url, article.published_date), article.published_date)
+
+    if not oldest:
+        return articles
+
+    horizon = max(oldest.values())
+    return [article for article in articles if article.published_date >= horizon]
+
+
+def create_snapshot(feed_urls: List[str], articles: List[RawArticle]) -> FeedSnapshot:
+    """Store a new snapshot, evicting expired and least recently created ones."""
+    snapshot = FeedSnapshot(feed_urls, articles)
+    _snapshots[snapshot.id] = snapshot
+
+    while _snapshots:
+        oldest = next(iter(_snapshots.values()))
+        if not oldest.expired and len(_snapshots) <= settings.pagination_max_snapshots:
+            break
+        _snapshots.pop(oldest.id)
+
+    return snapshot
+
+
+def get_snapshot(snapshot_id: str) -> Optional[FeedSnapshot]:
+    """Get a stored snapshot unless it has expired."""
+    snapshot = _snapshots.get(snapshot_id)
+    if snapshot is None or snapshot.expired:
+        return None
+    return snapshot
+
+
+def encode_cursor(snapshot_id: str, position: int) -> str:
+    """Encode a snapshot ID and article position as an opaque cursor."""
+    payload = json.dumps({"s": snapshot_id, "p": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor into its snapshot ID and position. Raises ValueError if malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        snapshot_id, position = payload["s"], payload["p"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(snapshot_id, str) or not isinstance(position, int) or position < 0:
+        raise ValueError("Invalid cursor")
+    return snapshot_id, position
+
+
+class PagePrefetcher:
+    """
+    Speculatively builds the next page of a cursor in the background.
+    At most max_concurrency prefetches run at once, each limited to budget seconds.
+    A prefetch that is not claimed within ttl seconds is cancelled and dropped, as is one
+    claimed while still queued, so a client never waits behind other speculative work.
+    """
+
+    def __init__(self, max_concurrency: int, budget: float, ttl: float):
+        self.budget = budget
+        self.ttl = ttl
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: Dict[Any, Tuple[asyncio.Task, asyncio.TimerHandle]] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    def schedule(self, key: Any, compute: Callable[[], Awaitable[Any]]) -> None:
+        """Start prefetching key unless it is already pending."""
+        if key in self._pending:
+            return
+
+        # Run in an empty context so the prefetch is not attributed to the request that scheduled it
+        task = contextvars.Context().run(asyncio.create_task, self._run(compute))
+        task.add_done_callback(self._log_failure)
+        expiry = asyncio.get_running_loop().call_later(self.ttl, self._expire, key)
+        self._pending[key] = (task, expiry)
+
+    def claim(self, key: Any) -> Optional[asyncio.Task]:
+        """
+        Take ownership of a prefetch that is running or finished.
+        A prefetch still queued for a slot is cancelled instead and None returned.
+        """
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return None
+
+        task, expiry = pending
+        expiry.cancel()
+        if task.done() or task in self._running:
+            return task
+
+        task.cancel()
+        return None
+
+    async def _run(self, compute: Callable[[], Awaitable[Any]]) -> Any:
+        # Queue behind other prefetches so they never compete with each other for OpenAI
+        async with self._semaphore:
+            task = asyncio.current_task()
+            self._running.add(task)
+            try:
+                return await asyncio.wait_for(compute(), self.budget)
+            finally:
+                self._running.discard(task)
+
+    def _expire(self, key: Any) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending[0].cancel()
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.info(f"Page prefetch failed: {str(task.exception())}")
+
+
+page_prefetcher = PagePrefetcher(
+    max_concurrency=settings.prefetch_concurrency,
+    budget=settings.prefetch_budget,
+    ttl=settings.prefetch_ttl,
+)
@@ -0,0 +1,136 @@
+import contextvars
+import functools
+import hmac
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Profile of the request currently being handled, and the innermost profiled call leading here
+_active_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar("active_profile", default=None)
+_current_span: contextvars.ContextVar[Optional["_Span"]] = contextvars.ContextVar("current_span", default=None)
+
+# Finished profiles keyed by request ID, oldest first
+_profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+
+class _Span:
+    """A profiled call in progress and the time its profiled children took."""
+
+    def __init__(self, stack: str):
+        self.stack = stack
+        self.children_micros = 0
+
+
+class RequestProfile:
+    """
+    CPU stack samples and awaited-call self times for a single request.
+    Both are kept as folded stacks ("frame;frame;frame weight"), the input format of
+    flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, request_id: str, thread_id: int):
+        self.request_id = request_id
+        self.thread_id = thread_id
+        self.cpu_samples: Counter = Counter()
+        self.wait_micros: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{request_id}", daemon=True)
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        """
+        Periodically record the event loop thread's Python stack while it is busy.
+        Samples of the loop idling in its selector are skipped. Other requests sharing
+        the loop show up in the samples as well.
+        """
+        while not self._stop.wait(settings.profiling_sample_interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None and frame.f_globals.get("__name__") == "selectors":
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.cpu_samples[";".join(reversed(stack))] += 1
+
+    def folded(self, kind: str = "cpu") -> str:
+        """Render the CPU samples or wait timings as folded stacks."""
+        counts = self.cpu_samples if kind == "cpu" else self.wait_micros
+        return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+def profiled(func):
+    """
+    Record the self time of each call of an async pipeline function while a request is profiled,
+    i.e. its duration minus that of the profiled calls it awaited. Children run concurrently
+    through asyncio.gather can outlast their parent, in which case its self time is zero.
+    Returns the function unchanged when profiling is disabled in settings.
+    """
+    if not settings.profiling_token:
+        return func
+
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return await func(*args, **kwargs)
+
+        parent = _current_span.get()
+        span = _Span(f"{parent.stack};{name}" if parent else name)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            elapsed = int((time.perf_counter() - started) * 1_000_000)
+            profile.wait_micros[span.stack] += max(elapsed - span.children_micros, 0)
+            if parent:
+                parent.children_micros += elapsed
+            _current_span.reset(token)
+
+    return wrapper
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check a caller-supplied token against the configured profiling token."""
+    if not settings.profiling_token or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), settings.profiling_token.encode("utf-8"))
+
+
+@asynccontextmanager
+async def profile_request():
+    """Profile everything awaited within the block and store the result under a new request ID."""
+    profile = RequestProfile(uuid.uuid4().hex, threading.get_ident())
+    token = _active_profile.set(profile)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _active_profile.reset(token)
+        _profiles[profile.request_id] = profile
+        while len(_profiles) > settings.profiling_max_profiles:
+            _profiles.popitem(last=False)
+
+
+def get_profile(request_id: str) -> Optional[RequestProfile]:
+    """Get a stored profile by request ID."""
+    return _profiles.get(request_id)
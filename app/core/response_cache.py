@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CacheKey = Tuple[Tuple[str, ...], int, Optional[str], Tuple[str, ...], Optional[int]]
+
+
+def make_cache_key(
+    feed_urls: List[str],
+    limit: int,
+    sentiment: Optional[str],
+    languages: List[str],
+    max_pages: Optional[int] = None,
+) -> CacheKey:
+    """
+    Build a cache key that ignores the order and duplication of feed URLs.
+    Languages keep their order, as generated contents are returned in that order.
+    """
+    return tuple(sorted(set(feed_urls))), limit, sentiment, tuple(languages), max_pages
+
+
+class CacheEntry:
+    """A rendered response body and headers with its ETag and creation time."""
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.headers = headers or {}
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.created = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+class ResponseCache:
+    """
+    LRU cache of rendered responses with stale-while-revalidate.
+    Entries younger than ttl are served as is. Entries up to stale_ttl past that are
+    served immediately while a single background task recomputes them. Concurrent
+    misses for the same key share one computation.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, stale_ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._bytes = 0
+        # In-flight refreshes started before an invalidation of their feeds, whose results are not stored
+        self._discarded: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get_or_compute(self, key: CacheKey, compute: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]) -> CacheEntry:
+        """Get the cached response for key, computing it with compute() if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = entry.age
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._start_refresh(key, compute)
+                return entry
+
+        self.misses += 1
+        # Shield so a disconnecting client does not cancel a computation others may be awaiting
+        return await asyncio.shield(self._start_refresh(key, compute))
+
+    def _start_refresh(self, key: CacheKey, compute: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]) -> asyncio.Task:
+        """Start computing key unless a computation is already running."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._refresh_done(key, t))
+        return task
+
+    async def _refresh(self, key: CacheKey, compute: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]) -> CacheEntry:
+        entry = CacheEntry(*await compute())
+
+        # Drop results that may have been computed from feeds invalidated meanwhile
+        if asyncio.current_task() not in self._discarded:
+            self._store(key, entry)
+        return entry
+
+    def _refresh_done(self, key: CacheKey, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        self._discarded.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error refreshing cached response: {str(task.exception())}")
+
+    def _store(self, key: CacheKey, entry: CacheEntry) -> None:
+        self._remove(key)
+        if len(entry.body) > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self._bytes += len(entry.body)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def invalidate(self, feed_urls: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop cached responses built from any of the given feeds, or all responses if none are given.
+        Returns the number of entries removed.
+        """
+        urls = set(feed_urls or [])
+        for key, task in self._inflight.items():
+            if not urls or urls.intersection(key[0]):
+                self._discarded.add(task)
+
+        keys = [key for key in self._entries if not urls or urls.intersection(key[0])]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache size and hit counters."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    ttl=settings.response_cache_ttl,
+    stale_ttl=settings.response_cache_stale_ttl,
+)
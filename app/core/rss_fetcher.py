@@ -1,19 +1,36 @@
 import asyncio
 import logging
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, List, Optional
 from urllib.parse import urlparse
 
 import feedparser
 import httpx
 from bs4 import BeautifulSoup
+from feedparser.sanitizer import _sanitize_html
 
+from app.config import get_settings
+from app.core.profiler import profiled
 from app.models.article import RawArticle
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
+# Element names (namespace stripped) that delimit a single feed entry
+ENTRY_TAGS = {"item", "entry"}
 
+# Namespace URIs of the feed formats and extensions we map onto feedparser keys
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+FEED_NAMESPACES = {"", ATOM_NS, RSS1_NS}
+
+
+@profiled
 async def fetch_feed_by_url(url: str) -> List[Dict]:
     """Fetch and parse an RSS feed by URL."""
     try:
@@ -37,6 +54,187 @@ async def fetch_feed_by_url(url: str) -> List[Dict]:
         return []
 
 
+def _split_tag(tag: str) -> tuple:
+    """Split an ElementTree tag into its (namespace, local name) parts."""
+    if tag.startswith("{"):
+        namespace, _, local = tag[1:].partition("}")
+        return namespace, local
+    return "", tag
+
+
+def _parse_entry_date(value: str) -> Optional[datetime]:
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date into an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _element_to_entry(element: ET.Element) -> feedparser.FeedParserDict:
+    """
+    Convert an RSS <item> or Atom <entry> element into a feedparser-style entry.
+    Only the keys read by process_feed_entry are populated. Summary and content HTML
+    goes through feedparser's sanitizer, as it would when parsing the feed in full.
+    """
+    entry = feedparser.FeedParserDict()
+    
+    for child in element:
+        namespace, name = _split_tag(child.tag)
+        text = (child.text or "").strip()
+        
+        # Dublin Core and content:encoded are the only extensions we understand
+        if namespace == DC_NS:
+            name = {"date": "published", "creator": "author"}.get(name)
+        elif namespace == CONTENT_NS:
+            name = "content" if name == "encoded" else None
+        elif namespace not in FEED_NAMESPACES:
+            continue
+        
+        if name == "title":
+            entry["title"] = text
+        elif name == "link":
+            # Atom links carry the URL in href; prefer the alternate link
+            href = child.get("href")
+            if href is None:
+                entry["link"] = text
+            elif child.get("rel", "alternate") == "alternate" or "link" not in entry:
+                entry["link"] = href
+        elif name in ("pubDate", "published"):
+            entry["published"] = text
+        elif name == "updated" and "published" not in entry:
+            entry["published"] = text
+        elif name in ("description", "summary"):
+            entry["summary"] = _sanitize_html(text, "utf-8", "text/html")
+        elif name == "content" and text:
+            entry["content"] = [feedparser.FeedParserDict(value=_sanitize_html(text, "utf-8", "text/html"))]
+        elif name == "author":
+            # Atom authors wrap the display name in a <name> child
+            author_name = next((c.text for c in child if _split_tag(c.tag)[1] == "name"), None)
+            entry["author"] = (author_name or text).strip()
+        elif name == "source":
+            entry["source"] = feedparser.FeedParserDict(title=text)
+    
+    return entry
+
+
+def _newest_entries(
+    entries: List[Dict],
+    max_entries: Optional[int] = None,
+    published_after: Optional[datetime] = None,
+) -> List[Dict]:
+    """
+    Get the newest max_entries entries published after the cutoff, newest first.
+    Entries without a parseable date count as newest, as process_feed_entry dates them now.
+    """
+    newest_first = datetime.max.replace(tzinfo=timezone.utc)
+    dated = [(_parse_entry_date(entry.get("published", "")) or newest_first, entry) for entry in entries]
+    if published_after is not None:
+        dated = [(published, entry) for published, entry in dated if published >= published_after]
+    dated.sort(key=lambda item: item[0], reverse=True)
+    
+    entries = [entry for _, entry in dated]
+    return entries[:max_entries] if max_entries is not None else entries
+
+
+async def parse_feed_stream(
+    chunks: AsyncIterator[bytes],
+    max_entries: Optional[int] = None,
+    published_after: Optional[datetime] = None,
+) -> List[Dict]:
+    """
+    Parse RSS/Atom items from a stream of body chunks.
+    Stops consuming chunks after max_entries items, or at the first item published before
+    published_after, as long as every item so far was dated and newest-first. Feeds in any
+    other order are read to the end and their newest items picked afterwards.
+    Raises ElementTree.ParseError if the feed is not well-formed XML.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    entries = []
+    last_published = None
+    newest_first = True
+    
+    async for chunk in chunks:
+        parser.feed(chunk)
+        
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            
+            stack.pop()
+            namespace, name = _split_tag(element.tag)
+            if name not in ENTRY_TAGS or namespace not in FEED_NAMESPACES:
+                continue
+            
+            entry = _element_to_entry(element)
+            
+            # Drop the parsed item so memory stays bounded by the entries we keep
+            if stack:
+                stack[-1].remove(element)
+            
+            published = _parse_entry_date(entry.get("published", ""))
+            if published is None or (last_published is not None and published > last_published):
+                newest_first = False
+            last_published = published
+            
+            if newest_first:
+                if published_after is not None and published < published_after:
+                    return entries
+                entries.append(entry)
+                if max_entries is not None and len(entries) >= max_entries:
+                    return entries
+            else:
+                entries.append(entry)
+    
+    parser.close()
+    return entries if newest_first else _newest_entries(entries, max_entries, published_after)
+
+
+@profiled
+async def stream_feed_by_url(
+    url: str,
+    max_entries: Optional[int] = None,
+    published_after: Optional[datetime] = None,
+) -> List[Dict]:
+    """
+    Fetch and parse an RSS/Atom feed incrementally, reading only as much of the body
+    as parse_feed_stream needs. Falls back to feedparser if the feed is not well-formed XML.
+    """
+    if published_after is not None and published_after.tzinfo is None:
+        published_after = published_after.replace(tzinfo=timezone.utc)
+    
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                entries = await parse_feed_stream(
+                    response.aiter_bytes(settings.feed_stream_chunk_size), max_entries, published_after
+                )
+    except ET.ParseError as e:
+        logger.info(f"Feed {url} is not well-formed XML, falling back to feedparser: {str(e)}")
+        return _newest_entries(await fetch_feed_by_url(url), max_entries, published_after)
+    except Exception as e:
+        logger.error(f"Error streaming feed {url}: {str(e)}")
+        return []
+    
+    if not entries and published_after is None:
+        # Nothing recognisable as an item; let feedparser handle exotic formats
+        logger.info(f"No entries streamed from feed {url}, falling back to feedparser")
+        return _newest_entries(await fetch_feed_by_url(url), max_entries, published_after)
+    
+    return entries
+
+
+@profiled
 async def extract_full_content(url: str, summary: str) -> str:
     """
     Extract full article content from URL.
@@ -76,6 +274,7 @@ async def extract_full_content(url: str, summary: str) -> str:
         return summary
 
 
+@profiled
 async def process_feed_entry(entry: Dict) -> Optional[RawArticle]:
     """Process a single feed entry into a RawArticle."""
     try:
@@ -128,21 +327,47 @@ async def process_feed_entry(entry: Dict) -> Optional[RawArticle]:
         return None
 
 
-async def process_feed_entries(feed_urls: List[str]) -> List[RawArticle]:
-    """Process entries from multiple feed URLs."""
+@profiled
+async def process_feed_entries(
+    feed_urls: List[str],
+    max_entries_per_feed: Optional[int] = None,
+) -> List[RawArticle]:
+    """
+    Process entries from multiple feed URLs.
+    Only the newest max_entries_per_feed items of each feed are kept, and only items from
+    the last feed_max_age_hours if that is set. With feed streaming enabled, feeds are read
+    no further than needed to find them.
+    """
     all_entries = []
     
+    published_after = None
+    if settings.feed_max_age_hours:
+        published_after = datetime.now(timezone.utc) - timedelta(hours=settings.feed_max_age_hours)
+    
     # Fetch all feeds concurrently
-    feed_tasks = [fetch_feed_by_url(url) for url in feed_urls]
-    feed_results = await asyncio.gather(*feed_tasks)
+    if settings.stream_feeds:
+        feed_tasks = [stream_feed_by_url(url, max_entries_per_feed, published_after) for url in feed_urls]
+        feed_results = await asyncio.gather(*feed_tasks)
+    else:
+        feed_tasks = [fetch_feed_by_url(url) for url in feed_urls]
+        feed_results = [
+            _newest_entries(entries, max_entries_per_feed, published_after)
+            for entries in await asyncio.gather(*feed_tasks)
+        ]
     
     # Process all entries
-    for entries in feed_results:
+    for url, entries in zip(feed_urls, feed_results):
         entry_tasks = [process_feed_entry(entry) for entry in entries]
         processed_entries = await asyncio.gather(*entry_tasks)
-        all_entries.extend([entry for entry in processed_entries if entry])
+        # Judged on raw entries, so a failed entry cannot hide that the feed was cut short
+        truncated = max_entries_per_feed is not None and len(entries) >= max_entries_per_feed
+        for entry in processed_entries:
+            if entry:
+                entry.feed_url = url
+                entry.feed_truncated = truncated
+                all_entries.append(entry)
     
     # Sort by published date (newest first)
     all_entries.sort(key=lambda x: x.published_date, reverse=True)
     
-    return all_entries
\ No newline at end of file
+    return all_entries
@@ -20,6 +20,8 @@ class RawArticle(BaseModel):
     summary: str
     content: str
     source: str
+    feed_url: str = ""
+    feed_truncated: bool = False
 
 
 class ProcessedArticle(BaseModel):
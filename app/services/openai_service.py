@@ -4,6 +4,7 @@ from typing import Dict, List, Tuple
 from openai import AsyncOpenAI
 
 from app.config import get_settings
+from app.core.profiler import profiled
 from app.models.article import SentimentType
 
 logger = logging.getLogger(__name__)
@@ -12,6 +13,7 @@ settings = get_settings()
 client = AsyncOpenAI(api_key=settings.openai_api_key)
 
 
+@profiled
 async def analyze_sentiment(text: str) -> Tuple[SentimentType, float]:
     """
     Analyze the sentiment of a text using OpenAI.
@@ -57,6 +59,7 @@ async def analyze_sentiment(text: str) -> Tuple[SentimentType, float]:
         return SentimentType.NEUTRAL, 0.0
 
 
+@profiled
 async def generate_summary(article_text: str, sentiment: SentimentType, word_count: int = 150) -> str:
     """Generate a summary of the article based on its sentiment."""
     try:
@@ -88,6 +91,7 @@ async def generate_summary(article_text: str, sentiment: SentimentType, word_cou
         return ""
 
 
+@profiled
 async def generate_article(original_text: str, language: str = "en") -> Dict[str, str]:
     """
     Generate a new article based on the original content.
@@ -153,6 +157,7 @@ async def generate_article(original_text: str, language: str = "en") -> Dict[str
         }
 
 
+@profiled
 async def generate_image_prompt(article_text: str, title: str) -> str:
     """Generate a prompt for image creation based on article content."""
     try:
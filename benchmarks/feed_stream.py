@@ -0,0 +1,101 @@
+"""
+Compare streaming feed parsing with the full feedparser path on large synthetic RSS feeds.
+
+Run from the repository root:
+
+    python -m benchmarks.feed_stream
+
+The feed is served from a local HTTP server. For each feed size the script reports wall
+time and peak traced memory for stream_feed_by_url with a small entry limit, and for
+fetch_feed_by_url, which downloads and parses the whole feed.
+"""
+import argparse
+import asyncio
+import threading
+import time
+import tracemalloc
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.rss_fetcher import fetch_feed_by_url, stream_feed_by_url
+
+
+def build_feed(items: int, description_size: int = 2000) -> bytes:
+    """Build an RSS 2.0 feed with `items` entries, newest first."""
+    now = datetime.now(timezone.utc)
+    entries = "".join(
+        f"<item><title>Item {i}</title><link>https://example.com/{i}</link>"
+        f"<pubDate>{format_datetime(now - timedelta(minutes=i))}</pubDate>"
+        f"<description>{'x' * description_size}</description>"
+        f"<content:encoded>Body of item {i}</content:encoded></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>Benchmark</title>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+def serve(body: bytes) -> ThreadingHTTPServer:
+    """Serve body on an ephemeral localhost port from a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The streaming parser hangs up once it has enough entries
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def measure(coro_factory):
+    """Run a coroutine and return (entries, seconds, peak KiB)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    entries = await coro_factory()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(entries), elapsed, peak / 1024
+
+
+async def main(sizes, limit):
+    print(f"{'items':>7} {'size MB':>8} | {'stream n':>8} {'ms':>8} {'peak KiB':>10} | {'full n':>7} {'ms':>8} {'peak KiB':>10}")
+    for items in sizes:
+        body = build_feed(items)
+        server = serve(body)
+        url = f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+        try:
+            # Warm up httpx and the SSL/codec imports so the first size is not penalised
+            await stream_feed_by_url(url, max_entries=1)
+            streamed = await measure(lambda: stream_feed_by_url(url, max_entries=limit))
+            full = await measure(lambda: fetch_feed_by_url(url))
+        finally:
+            server.shutdown()
+
+        print(
+            f"{items:>7} {len(body) / 1e6:>8.1f} | "
+            f"{streamed[0]:>8} {streamed[1] * 1000:>8.1f} {streamed[2]:>10.0f} | "
+            f"{full[0]:>7} {full[1] * 1000:>8.1f} {full[2]:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.limit))
@@ -0,0 +1,4 @@
+import os
+
+# openai_service builds its client at import time and refuses to do so without a key
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,209 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.endpoints import articles
+from app.core import pagination
+from app.core.pagination import (
+    PagePrefetcher,
+    create_snapshot,
+    decode_cursor,
+    encode_cursor,
+    get_snapshot,
+)
+from app.core.response_cache import ResponseCache
+from app.models.article import RawArticle
+
+NOW = datetime(2024, 1, 10, 12, 0)
+
+
+def raw(feed_url: str, hours_ago: float, truncated: bool = False) -> RawArticle:
+    return RawArticle(
+        title=f"{feed_url} -{hours_ago}h", url=f"https://example.com/{feed_url}/{hours_ago}",
+        published_date=NOW - timedelta(hours=hours_ago), summary="", content="", source="",
+        feed_url=feed_url, feed_truncated=truncated,
+    )
+
+
+def newest_first(articles):
+    return sorted(articles, key=lambda a: a.published_date, reverse=True)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("abc", 15)) == ("abc", 15)
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "eyJzIjoieCJ9", encode_cursor("abc", -1)])
+def test_decode_cursor_rejects_malformed_cursors(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_snapshots_are_evicted_by_count_and_age(monkeypatch):
+    monkeypatch.setattr(pagination, "_snapshots", pagination.OrderedDict())
+    monkeypatch.setattr(pagination.settings, "pagination_max_snapshots", 2)
+
+    snapshots = [create_snapshot(["a"], []) for _ in range(3)]
+    assert get_snapshot(snapshots[0].id) is None
+    assert get_snapshot(snapshots[2].id) is snapshots[2]
+
+    snapshots[2].created -= pagination.settings.pagination_snapshot_ttl + 1
+    assert get_snapshot(snapshots[2].id) is None
+
+
+def test_snapshot_without_truncated_feeds_keeps_everything():
+    articles = newest_first([raw("a", h) for h in range(3)] + [raw("b", h) for h in range(10, 12)])
+
+    assert create_snapshot(["a", "b"], articles).articles == articles
+
+
+def test_snapshot_stops_where_a_truncated_feed_may_have_unread_items():
+    # Feed a has more items than were read, all newer than feed b
+    articles = newest_first([raw("a", h, truncated=True) for h in range(3)] + [raw("b", h) for h in range(10, 12)])
+
+    snapshot = create_snapshot(["a", "b"], articles)
+
+    assert [a.feed_url for a in snapshot.articles] == ["a", "a", "a"]
+
+
+async def test_feeds_are_marked_truncated_by_raw_entry_count(monkeypatch):
+    from app.core import rss_fetcher
+
+    feeds = {"a": [("a", i) for i in range(3)], "b": [("b", i) for i in range(2)]}
+
+    async def fetch_feed_by_url(url):
+        return feeds[url]
+
+    async def process_feed_entry(entry):
+        # The newest entry of feed a fails, which must not hide that the feed was cut short
+        return None if entry == ("a", 0) else raw(*entry)
+
+    monkeypatch.setattr(rss_fetcher.settings, "stream_feeds", False)
+    monkeypatch.setattr(rss_fetcher, "fetch_feed_by_url", fetch_feed_by_url)
+    monkeypatch.setattr(rss_fetcher, "_newest_entries", lambda entries, max_entries, published_after: entries)
+    monkeypatch.setattr(rss_fetcher, "process_feed_entry", process_feed_entry)
+
+    entries = await rss_fetcher.process_feed_entries(["a", "b"], max_entries_per_feed=3)
+
+    assert {(e.feed_url, e.feed_truncated) for e in entries} == {("a", True), ("b", False)}
+
+
+async def test_prefetch_can_be_claimed():
+    prefetcher = PagePrefetcher(max_concurrency=1, budget=1, ttl=1)
+
+    async def compute():
+        return "page"
+
+    prefetcher.schedule(("snap", 3), compute)
+    await asyncio.sleep(0)
+    task = prefetcher.claim(("snap", 3))
+
+    assert await task == "page"
+    assert prefetcher.claim(("snap", 3)) is None
+
+
+async def test_unclaimed_prefetch_is_cancelled_after_ttl():
+    prefetcher = PagePrefetcher(max_concurrency=1, budget=1, ttl=0.01)
+    started = asyncio.Event()
+
+    async def compute():
+        started.set()
+        await asyncio.sleep(1)
+
+    prefetcher.schedule(("snap", 3), compute)
+    task = prefetcher._pending[("snap", 3)][0]
+    await started.wait()
+    await asyncio.sleep(0.05)
+
+    assert task.cancelled()
+    assert prefetcher.claim(("snap", 3)) is None
+
+
+async def test_prefetch_is_limited_by_budget():
+    prefetcher = PagePrefetcher(max_concurrency=1, budget=0.01, ttl=1)
+
+    async def compute():
+        await asyncio.sleep(1)
+
+    prefetcher.schedule(("snap", 3), compute)
+    await asyncio.sleep(0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await prefetcher.claim(("snap", 3))
+
+
+async def test_claiming_a_queued_prefetch_cancels_it():
+    prefetcher = PagePrefetcher(max_concurrency=1, budget=1, ttl=1)
+
+    async def compute():
+        await asyncio.sleep(1)
+
+    prefetcher.schedule(("snap", 3), compute)
+    prefetcher.schedule(("snap", 6), compute)
+    await asyncio.sleep(0)
+    running = prefetcher._pending[("snap", 3)][0]
+    queued = prefetcher._pending[("snap", 6)][0]
+
+    assert prefetcher.claim(("snap", 6)) is None
+    await asyncio.sleep(0)
+    assert queued.cancelled()
+
+    assert prefetcher.claim(("snap", 3)) is running
+    running.cancel()
+
+
+async def test_serving_a_cached_first_page_prefetches_the_next(monkeypatch):
+    prefetcher = PagePrefetcher(max_concurrency=1, budget=1, ttl=1)
+    monkeypatch.setattr(articles, "page_prefetcher", prefetcher)
+    monkeypatch.setattr(articles, "response_cache", ResponseCache(max_bytes=1024 * 1024, ttl=30, stale_ttl=60))
+    monkeypatch.setattr(pagination, "_snapshots", pagination.OrderedDict())
+    monkeypatch.setattr(articles.settings, "response_cache_enabled", True)
+
+    async def process_feed_entries(feed_urls, max_entries_per_feed=None):
+        return [raw("a", h) for h in range(4)]
+
+    async def build_page(snapshot, position, limit, sentiment, languages):
+        return [], position + limit
+
+    monkeypatch.setattr(articles, "process_feed_entries", process_feed_entries)
+    monkeypatch.setattr(articles, "build_page", build_page)
+    monkeypatch.setattr(articles, "is_authorized", lambda token: False)
+
+    async def serve():
+        return await articles.fetch_and_process_articles(
+            articles.Response(), feed_urls=["a"], limit=2, sentiment=None, languages=["en"], cursor=None,
+            max_pages=2, profile=False, x_profile=None, if_none_match=None,
+        )
+
+    first = await serve()
+    snapshot_id, position = decode_cursor(first.headers["X-Next-Cursor"])
+    assert list(prefetcher._pending) == [(snapshot_id, 2, 2, None, ("en",))]
+
+    # A cache hit schedules the same prefetch again if it was claimed or expired meanwhile
+    prefetcher._expire((snapshot_id, 2, 2, None, ("en",)))
+    await serve()
+    assert list(prefetcher._pending) == [(snapshot_id, 2, 2, None, ("en",))]
+    prefetcher._expire((snapshot_id, 2, 2, None, ("en",)))
+
+
+async def test_process_articles_prefetches_only_when_asked(monkeypatch):
+    prefetcher = PagePrefetcher(max_concurrency=1, budget=1, ttl=1)
+    monkeypatch.setattr(articles, "page_prefetcher", prefetcher)
+    monkeypatch.setattr(pagination, "_snapshots", pagination.OrderedDict())
+
+    async def process_feed_entries(feed_urls, max_entries_per_feed=None):
+        return [raw("a", h) for h in range(4)]
+
+    async def build_page(snapshot, position, limit, sentiment, languages):
+        return [], position + limit
+
+    monkeypatch.setattr(articles, "process_feed_entries", process_feed_entries)
+    monkeypatch.setattr(articles, "build_page", build_page)
+
+    _, cursor = await articles.process_articles(["a"], 2, None, ["en"], prefetch=False)
+    assert not prefetcher._pending
+
+    _, next_cursor = await articles.process_articles(["a"], 2, None, ["en"], cursor=cursor)
+    snapshot_id, position = decode_cursor(next_cursor)
+    assert (snapshot_id, 4, 2, None, ("en",)) in prefetcher._pending
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from app.core import profiler
+from app.core.profiler import get_profile, is_authorized, profile_request, profiled
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setattr(profiler.settings, "profiling_token", "secret")
+    monkeypatch.setattr(profiler.settings, "profiling_sample_interval", 0.001)
+    return "secret"
+
+
+def test_profiled_returns_function_unchanged_without_token(monkeypatch):
+    monkeypatch.setattr(profiler.settings, "profiling_token", "")
+
+    async def work():
+        pass
+
+    assert profiled(work) is work
+
+
+def test_is_authorized(token):
+    assert is_authorized("secret")
+    assert not is_authorized("wrong")
+    assert not is_authorized(None)
+
+
+def test_is_authorized_rejects_everything_without_token(monkeypatch):
+    monkeypatch.setattr(profiler.settings, "profiling_token", "")
+
+    assert not is_authorized("")
+    assert not is_authorized("anything")
+
+
+async def test_wait_profile_records_self_time(token):
+    @profiled
+    async def child():
+        await asyncio.sleep(0.05)
+
+    @profiled
+    async def parent():
+        await child()
+
+    async with profile_request() as profile:
+        await parent()
+
+    parent_stack = f"{__name__}.{parent.__qualname__}"
+    child_stack = f"{parent_stack};{__name__}.{child.__qualname__}"
+    assert profile.wait_micros[child_stack] >= 45_000
+    assert profile.wait_micros[parent_stack] < 10_000
+    assert f"{child_stack} {profile.wait_micros[child_stack]}" in profile.folded("wait").splitlines()
+
+
+async def test_profiled_calls_outside_a_profile_are_not_recorded(token):
+    @profiled
+    async def work():
+        return 42
+
+    assert await work() == 42
+
+    async with profile_request() as profile:
+        pass
+
+    assert not profile.wait_micros
+
+
+async def test_cpu_samples_skip_idle_loop(token):
+    async with profile_request() as profile:
+        await asyncio.sleep(0.05)
+        sum(i * i for i in range(200_000))
+
+    assert not any(stack.endswith("selectors.select") for stack in profile.cpu_samples)
+
+
+async def test_profiles_are_stored_under_generated_ids(token, monkeypatch):
+    monkeypatch.setattr(profiler.settings, "profiling_max_profiles", 2)
+
+    ids = []
+    for _ in range(3):
+        async with profile_request() as profile:
+            ids.append(profile.request_id)
+
+    assert len(set(ids)) == 3
+    assert get_profile(ids[0]) is None
+    assert get_profile(ids[2]).request_id == ids[2]
+
+
+@pytest.fixture
+def client(token, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.api.endpoints import articles
+    from app.main import app
+
+    async def process_articles(feed_urls, limit, sentiment, languages, cursor=None, max_pages=None, prefetch=True):
+        return [], None
+
+    monkeypatch.setattr(articles, "process_articles", process_articles)
+    return TestClient(app)
+
+
+def test_profiling_token_is_only_accepted_from_header(client):
+    params = {"feed_urls": "https://example.com/feed"}
+
+    profiled_response = client.get("/api/articles/fetch", params=params, headers={"X-Profile": "secret"})
+    assert "X-Profile-ID" in profiled_response.headers
+
+    flagged = client.get("/api/articles/fetch", params={**params, "profile": "true"}, headers={"X-Profile": "secret"})
+    assert "X-Profile-ID" in flagged.headers
+
+    assert client.get("/api/articles/fetch", params={**params, "profile": "true"}).status_code == 403
+    assert client.get("/api/articles/fetch", params={**params, "profile": "secret"}).status_code == 422
+
+
+def test_profiles_require_the_header_token(client):
+    profile_id = client.get(
+        "/api/articles/fetch", params={"feed_urls": "https://example.com/feed"}, headers={"X-Profile": "secret"}
+    ).headers["X-Profile-ID"]
+
+    assert client.get(f"/api/articles/profiles/{profile_id}").status_code == 404
+    assert client.get(f"/api/articles/profiles/{profile_id}", headers={"X-Profile": "secret"}).status_code == 200
@@ -0,0 +1,185 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import articles
+from app.core.response_cache import ResponseCache, make_cache_key
+from app.main import app
+from app.models.article import ArticleResponse, SentimentType
+
+
+class Computation:
+    """Counting compute() callable whose result changes on every call."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"body {self.calls}".encode(), {"X-Call": str(self.calls)}
+
+
+def age(cache: ResponseCache, key, seconds: float) -> None:
+    cache._entries[key].created -= seconds
+
+
+def test_make_cache_key_normalizes_feeds_but_keeps_language_order():
+    assert make_cache_key(["b", "a", "a"], 5, None, ["en"]) == make_cache_key(["a", "b"], 5, None, ["en"])
+    assert make_cache_key(["a"], 5, None, ["en", "hi"]) != make_cache_key(["a"], 5, None, ["hi", "en"])
+
+
+async def test_fresh_entries_are_served_from_cache():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    compute = Computation()
+    key = make_cache_key(["a"], 5, None, ["en"])
+
+    first = await cache.get_or_compute(key, compute)
+    second = await cache.get_or_compute(key, compute)
+
+    assert first is second
+    assert first.headers == {"X-Call": "1"}
+    assert compute.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+async def test_concurrent_misses_share_one_computation():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    compute = Computation(delay=0.01)
+    key = make_cache_key(["a"], 5, None, ["en"])
+
+    entries = await asyncio.gather(*[cache.get_or_compute(key, compute) for _ in range(5)])
+
+    assert compute.calls == 1
+    assert {entry.body for entry in entries} == {b"body 1"}
+
+
+async def test_stale_entries_are_served_while_one_refresh_runs():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    compute = Computation(delay=0.01)
+    key = make_cache_key(["a"], 5, None, ["en"])
+    await cache.get_or_compute(key, compute)
+    age(cache, key, 40)
+
+    stale = await cache.get_or_compute(key, compute)
+    also_stale = await cache.get_or_compute(key, compute)
+    assert stale.body == also_stale.body == b"body 1"
+
+    await asyncio.sleep(0.05)
+    refreshed = await cache.get_or_compute(key, compute)
+    assert refreshed.body == b"body 2"
+    assert compute.calls == 2
+
+
+async def test_entries_past_the_stale_window_are_recomputed():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    compute = Computation()
+    key = make_cache_key(["a"], 5, None, ["en"])
+    await cache.get_or_compute(key, compute)
+    age(cache, key, 100)
+
+    assert (await cache.get_or_compute(key, compute)).body == b"body 2"
+
+
+async def test_cache_is_bounded_by_bytes():
+    cache = ResponseCache(max_bytes=12, ttl=30, stale_ttl=60)
+    compute = Computation()
+    keys = [make_cache_key([url], 5, None, ["en"]) for url in "abc"]
+
+    for key in keys:
+        await cache.get_or_compute(key, compute)
+
+    assert cache.stats()["bytes"] <= 12
+    assert keys[0] not in cache._entries
+    assert keys[2] in cache._entries
+
+
+async def test_invalidate_drops_entries_of_the_given_feeds():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    compute = Computation()
+    await cache.get_or_compute(make_cache_key(["a", "b"], 5, None, ["en"]), compute)
+    await cache.get_or_compute(make_cache_key(["c"], 5, None, ["en"]), compute)
+
+    assert cache.invalidate(["b"]) == 1
+    assert cache.stats()["entries"] == 1
+    assert cache.invalidate() == 1
+
+
+async def test_invalidate_discards_inflight_refresh_of_that_feed_only():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    key_a = make_cache_key(["a"], 5, None, ["en"])
+    key_b = make_cache_key(["b"], 5, None, ["en"])
+
+    pending = [
+        asyncio.create_task(cache.get_or_compute(key_a, Computation(delay=0.01))),
+        asyncio.create_task(cache.get_or_compute(key_b, Computation(delay=0.01))),
+    ]
+    await asyncio.sleep(0)
+    cache.invalidate(["a"])
+    await asyncio.gather(*pending)
+
+    assert key_a not in cache._entries
+    assert key_b in cache._entries
+
+
+async def test_invalidate_keeps_no_state_for_unknown_feeds():
+    cache = ResponseCache(max_bytes=1024, ttl=30, stale_ttl=60)
+    key = make_cache_key(["a"], 5, None, ["en"])
+    refresh = asyncio.create_task(cache.get_or_compute(key, Computation(delay=0.01)))
+    await asyncio.sleep(0)
+
+    for i in range(100):
+        cache.invalidate([f"https://example.com/{i}"])
+    cache.invalidate(["a"])
+    assert len(cache._discarded) == 1
+
+    await refresh
+    await asyncio.sleep(0)
+    assert not cache._discarded
+    assert key not in cache._entries
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(articles, "response_cache", ResponseCache(max_bytes=1024 * 1024, ttl=30, stale_ttl=60))
+    calls = []
+
+    async def process_articles(feed_urls, limit, sentiment, languages, cursor=None, max_pages=None, prefetch=True):
+        calls.append(feed_urls)
+        article = ArticleResponse(
+            id="1", title="Title", summary="Summary", sentiment=SentimentType.NEUTRAL,
+            source="Source", published_date=datetime(2024, 1, 1),
+        )
+        return [article], None
+
+    monkeypatch.setattr(articles, "process_articles", process_articles)
+    test_client = TestClient(app)
+    test_client.calls = calls
+    return test_client
+
+
+def test_fetch_returns_etag_and_304_on_match(client):
+    params = {"feed_urls": ["https://example.com/a", "https://example.com/b"], "languages": ["en"]}
+
+    first = client.get("/api/articles/fetch", params=params)
+    assert first.status_code == 200
+    assert first.json()[0]["title"] == "Title"
+    etag = first.headers["ETag"]
+
+    reordered = {"feed_urls": list(reversed(params["feed_urls"])), "languages": ["en"]}
+    revalidated = client.get("/api/articles/fetch", params=reordered, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert len(client.calls) == 1
+
+    changed = client.get("/api/articles/fetch", params=params, headers={"If-None-Match": '"other"'})
+    assert changed.status_code == 200
+
+
+def test_fetch_deduplicates_feed_urls(client):
+    client.get("/api/articles/fetch", params={"feed_urls": ["https://example.com/a", "https://example.com/a"]})
+
+    assert client.calls == [["https://example.com/a"]]
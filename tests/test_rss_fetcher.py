@@ -0,0 +1,151 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import feedparser
+import httpx
+import pytest
+
+from app.core import rss_fetcher
+from app.core.rss_fetcher import _element_to_entry, parse_feed_stream, stream_feed_by_url
+
+NOW = datetime(2024, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def rss(items: str) -> bytes:
+    return (
+        '<rss xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:media="http://search.yahoo.com/mrss/">'
+        f"<channel><title>Feed</title>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def rss_item(i: int, published: datetime) -> str:
+    return f"<item><title>Item {i}</title><link>https://example.com/{i}</link><pubDate>{format_datetime(published)}</pubDate></item>"
+
+
+async def chunked(body: bytes, size: int = 64, consumed: list = None):
+    for start in range(0, len(body), size):
+        if consumed is not None:
+            consumed.append(start)
+        yield body[start:start + size]
+
+
+def test_element_to_entry_maps_rss_item():
+    element = ET.fromstring(rss(
+        "<item><title>Title</title><link>https://example.com/a</link>"
+        "<pubDate>Wed, 10 Jan 2024 12:00:00 +0000</pubDate><description>Summary</description>"
+        "<content:encoded>Body</content:encoded><dc:creator>Author</dc:creator>"
+        "<media:title>Ignored</media:title></item>"
+    )).find("channel/item")
+
+    entry = _element_to_entry(element)
+
+    assert entry["title"] == "Title"
+    assert entry["link"] == "https://example.com/a"
+    assert entry["published"] == "Wed, 10 Jan 2024 12:00:00 +0000"
+    assert entry["summary"] == "Summary"
+    assert entry.content[0].value == "Body"
+    assert entry["author"] == "Author"
+
+
+def test_element_to_entry_maps_atom_entry():
+    element = ET.fromstring(
+        '<entry xmlns="http://www.w3.org/2005/Atom"><title>Title</title>'
+        '<link rel="self" href="https://example.com/self"/><link href="https://example.com/a"/>'
+        "<updated>2024-01-10T12:00:00Z</updated><author><name>Author</name></author></entry>"
+    )
+
+    entry = _element_to_entry(element)
+
+    assert entry["link"] == "https://example.com/a"
+    assert entry["published"] == "2024-01-10T12:00:00Z"
+    assert entry["author"] == "Author"
+    assert "content" not in entry
+
+
+async def test_parse_feed_stream_stops_after_max_entries():
+    body = rss("".join(rss_item(i, NOW - timedelta(hours=i)) for i in range(200)))
+    consumed = []
+
+    entries = await parse_feed_stream(chunked(body, consumed=consumed), max_entries=3)
+
+    assert [e["title"] for e in entries] == ["Item 0", "Item 1", "Item 2"]
+    assert len(consumed) * 64 < len(body) / 10
+
+
+async def test_parse_feed_stream_stops_at_published_cutoff():
+    body = rss("".join(rss_item(i, NOW - timedelta(hours=i)) for i in range(10)))
+
+    entries = await parse_feed_stream(chunked(body), published_after=NOW - timedelta(hours=2, minutes=30))
+
+    assert [e["title"] for e in entries] == ["Item 0", "Item 1", "Item 2"]
+
+
+async def test_parse_feed_stream_picks_newest_from_oldest_first_feed():
+    body = rss("".join(rss_item(i, NOW - timedelta(hours=10 - i)) for i in range(10)))
+
+    entries = await parse_feed_stream(chunked(body), max_entries=2)
+
+    assert [e["title"] for e in entries] == ["Item 9", "Item 8"]
+
+
+async def test_parse_feed_stream_raises_on_malformed_xml():
+    with pytest.raises(ET.ParseError):
+        await parse_feed_stream(chunked(rss("<item><title>&nbsp;</title></item>")))
+
+
+async def test_stream_feed_by_url_falls_back_to_feedparser(monkeypatch):
+    body = rss("<item><title>&nbsp;</title></item>")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: real_client(transport=transport, **kwargs))
+
+    async def fetch_feed_by_url(url):
+        return [{"title": "Old", "published": format_datetime(NOW - timedelta(days=1))},
+                {"title": "New", "published": format_datetime(NOW)}]
+
+    monkeypatch.setattr(rss_fetcher, "fetch_feed_by_url", fetch_feed_by_url)
+
+    entries = await stream_feed_by_url("https://example.com/feed", max_entries=1)
+
+    assert [e["title"] for e in entries] == ["New"]
+
+
+@pytest.mark.parametrize("body", [
+    rss(
+        "<item><title>A &amp; B</title><link>https://example.com/a</link>"
+        "<description>&lt;p&gt;Hi&lt;script&gt;x()&lt;/script&gt; "
+        "&lt;a href=\"/rel\" onclick=\"e()\"&gt;l&lt;/a&gt;&lt;/p&gt;</description>"
+        "<content:encoded><![CDATA[<div>Body<script>y()</script><img src=\"x.png\" onerror=\"z()\"></div>]]>"
+        "</content:encoded></item>"
+    ),
+    (
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Title</title>'
+        b"<summary>A &amp; B &lt;b&gt;x&lt;/b&gt;</summary>"
+        b'<content type="html">&lt;p&gt;x&lt;script&gt;1&lt;/script&gt;&lt;/p&gt;</content></entry></feed>'
+    ),
+])
+async def test_parse_feed_stream_matches_feedparser_html(body):
+    expected = feedparser.parse(body).entries[0]
+
+    entry = (await parse_feed_stream(chunked(body)))[0]
+
+    assert entry["summary"] == expected.summary
+    assert entry.content[0].value == expected.content[0].value
+    assert "script" not in entry["summary"] + entry.content[0].value
+
+
+async def test_parse_feed_stream_ignores_extension_items():
+    body = rss(
+        "".join(
+            f'<item xmlns:x="urn:example"><title>Item {i}</title>'
+            f"<pubDate>{format_datetime(NOW - timedelta(hours=i))}</pubDate>"
+            "<x:entry>nested</x:entry><x:item>nested</x:item></item>"
+            for i in range(3)
+        )
+    )
+
+    entries = await parse_feed_stream(chunked(body), max_entries=2)
+
+    assert [e["title"] for e in entries] == ["Item 0", "Item 1"]